@@ -92,22 +92,18 @@ def get_hubb_trimer(spin_names, U=0, tk=0):
     spin_up = spin_names[0]
     spin_dn = spin_names[1]
 
+    # Sum the Bloch phases over the trimer sites (rows of phase) into a hopping
+    # matrix first, so only n_orb**2 operator terms are added per spin
+    orbs = np.arange(n_orb)
+    phase = np.exp(1j * phi * np.outer(orbs, orbs))
+    phase_next = np.exp(1j * phi * np.outer(np.mod(orbs + 1, n_orb), orbs))
+    t_mat = (-tk / float(n_orb)) * (
+        phase.conj().T @ phase_next + phase_next.conj().T @ phase
+    )
+
     h_loc = Operator()
-    for a, m, mm, s in product(range(n_orb), range(n_orb), range(n_orb), spin_names):
-        h_loc += (
-            (-tk / float(n_orb))
-            * get_c(s, m, True)
-            * get_c(s, mm, False)
-            * np.exp(-1j * phi * a * m)
-            * np.exp(1j * phi * np.mod(a + 1, n_orb) * mm)
-        )
-        h_loc += (
-            (-tk / float(n_orb))
-            * get_c(s, m, True)
-            * get_c(s, mm, False)
-            * np.exp(-1j * phi * np.mod(a + 1, n_orb) * m)
-            * np.exp(1j * phi * a * mm)
-        )
+    for s, m, mm in product(spin_names, range(n_orb), range(n_orb)):
+        h_loc += get_c(s, m, True) * get_c(s, mm, False) * t_mat[m, mm]
 
     for m, mm, mmm in product(range(n_orb), range(n_orb), range(n_orb)):
         h_loc += (
@@ -48,9 +48,9 @@ tbl = TBLattice(units=units, hoppings=hoppings, orbital_positions=[(0, 0, 0)] *
 bl = BravaisLattice(units=units)
 bz = BrillouinZone(bl)
 mk = MeshBrZone(bz, nkx)
-h0_k = {}
-for bl, _ in gf_struct:
-    h0_k[bl] = tbl.fourier(mk).data
+# Every spin block has the same dispersion, so they share one array
+h0_k_data = np.ascontiguousarray(tbl.fourier(mk).data)
+h0_k = {bl: h0_k_data for bl, _ in gf_struct}
 
 # Hubbard interaction
 h_int = hubbard(U=0, n_orb=n_orb)
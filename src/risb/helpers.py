@@ -20,7 +20,6 @@
 # from scipy.linalg import pinv
 # from scipy.special import binom
 import warnings
-from copy import deepcopy
 
 import numpy as np
 from scipy.linalg import inv, sqrtm
@@ -273,7 +272,11 @@ def get_f2(rho_f: np.ndarray, rho_qp: np.ndarray) -> np.ndarray:
 
 
 def get_h_qp(
-    R: np.ndarray, Lambda: np.ndarray, h0_kin_k: np.ndarray, mu: float = 0
+    R: np.ndarray,
+    Lambda: np.ndarray,
+    h0_kin_k: np.ndarray,
+    mu: float = 0,
+    out: np.ndarray | None = None,
 ) -> tuple[np.ndarray, np.ndarray]:
     r"""
     Construct the quasiparticle Hamiltonian :math:`\hat{H}^{\mathrm{qp}}`.
@@ -289,6 +292,9 @@ def get_h_qp(
         k, orb_i, orb_j
     mu : float, optional
         Chemical potential
+    out : numpy.ndarray, optional
+        Array to write the result into, so that it can be reused between
+        calls. Must have the shape and dtype of the result.
 
     Return
     ------
@@ -303,9 +309,12 @@ def get_h_qp(
 
     """
     # h_qp = np.einsum('ac,cdk,db->kab', R, h0_kin_k, R.conj().T, optimize='optimal') + (Lambda - mu*np.eye(Lambda.shape[0]))
-    h_qp = np.einsum("ac,kcd,db->kab", R, h0_kin_k, R.conj().T) + (
-        Lambda - mu * np.eye(Lambda.shape[0])
-    )
+    shift = Lambda - mu * np.eye(Lambda.shape[0])
+    if out is None:
+        h_qp = np.einsum("ac,kcd,db->kab", R, h0_kin_k, R.conj().T) + shift
+    else:
+        h_qp = np.einsum("ac,kcd,db->kab", R, h0_kin_k, R.conj().T, out=out)
+        h_qp += shift
     if not np.allclose(h_qp, np.swapaxes(h_qp, 1, 2).conj()):
         warnings.warn("H_qp is not Hermitian !", RuntimeWarning, stacklevel=2)
     # eig, vec = np.linalg.eigh(h_qp)
@@ -598,7 +607,9 @@ def get_h0_kin_k(
         the projectors.
 
     """
-    h0_kin_k = deepcopy(h0_k)
+    # Copy each block separately so blocks that share an array in h0_k are
+    # not aliased in the output (deepcopy would keep them shared)
+    h0_kin_k = {bl: np.array(h0_k[bl], copy=True) for bl in h0_k}
 
     if projectors is not None:
         n_clusters = len(projectors)
@@ -17,8 +17,11 @@
 #
 # Authors: Jonathan Karp, Alexander Hampel, Nils Wentzell, Hugo U. R. Strand, Olivier Parcollet
 
+import inspect
+import warnings
+
 import numpy as np
-from scipy.optimize import brentq
+from scipy.optimize import brenth, root_scalar
 
 # Code below copied from github.com/TRIQS/hartree_fock
 
@@ -38,39 +41,69 @@ def fermi(e, beta):
     return np.exp(-beta * e * (e > 0)) / (1 + np.exp(-beta * np.abs(e)))
 
 
-def update_mu(n_target, energies, beta, n_k, smear_function):
+def _accepts_out(func):
+    # Whether func can be called with an out= keyword to write into a buffer
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(
+        p.name == "out" or p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters
+    )
+
+
+def update_mu(
+    n_target, energies, beta, n_k, smear_function, mu0=None, smear_and_deriv=None
+):
     """
-    Update the chemical potential using :func:`scipy.optimize.brentq` for smearing k-space integrations.
+    Update the chemical potential with Newton's method or :func:`scipy.optimize.brenth` for smearing k-space integrations.
 
     Parameters
     ----------
     n_target : float
         Filling target
-    energies : numpy.ndarray
-        Array of eigenenergies
+    energies : dict[numpy.ndarray] | numpy.ndarray
+        Array of eigenenergies, or a dictionary of arrays for each block
     beta : float
         Inverse temperature
     n_k : int
         Number of unit cells on lattice
     smear_function:
-        The function that smears the energy at each k-point.
+        The function that smears the energy at each k-point, called as
+        ``smear_function(energies, beta, mu)``. If it also accepts an ``out``
+        keyword, the result is written into a scratch buffer that is reused
+        between evaluations.
+    mu0 : float, optional
+        Guess for the chemical potential, e.g., from a previous call. The
+        root is bracketed by expanding outward from it in steps of
+        ``1 / beta``, instead of using the whole band. Only give it if the
+        filling is monotonic in ``mu``, otherwise the root found can depend
+        on the guess.
+    smear_and_deriv : optional
+        Returns the smearing function and its derivative with respect to
+        ``mu``, called as
+        ``smear_and_deriv(energies, beta, mu, out=out, out_deriv=out_deriv)``
+        and writing them into the two buffers. If given, Newton's method is
+        tried first, and the bracketing search with
+        :func:`scipy.optimize.brenth` is only used if it does not converge.
 
     """
-    e_min = np.inf
-    e_max = -np.inf
-    for en in energies.values():
-        bl_min = en.min()
-        bl_max = en.max()
-        if bl_min < e_min:
-            e_min = bl_min
-        if bl_max > e_max:
-            e_max = bl_max
+    # Flatten all blocks into one contiguous buffer once so that each
+    # evaluation of the target function is a single vectorized call
+    if isinstance(energies, dict):
+        energies = np.concatenate([np.ravel(en) for en in energies.values()])
+    else:
+        energies = np.ravel(energies)
+
+    # Scratch space reused by every evaluation of the target function, if the
+    # smearing function can write into it
+    smeared = np.empty(energies.shape)
+    smear_kwargs = {"out": smeared} if _accepts_out(smear_function) else {}
 
     def target_function(mu):
-        n = 0
-        for en in energies.values():
-            n += np.sum(smear_function(en, beta, mu)) / n_k
-        return n - n_target
+        return (
+            np.sum(smear_function(energies, beta, mu, **smear_kwargs)) / n_k - n_target
+        )
 
     def adjust_brackets(e_min, e_max):
         """
@@ -92,10 +125,70 @@ def update_mu(n_target, energies, beta, n_k, smear_function):
         else:
             return e_min, e_max
 
+    def bracket_from_guess(mu0, max_doublings=32):
+        """
+        Expand outward from mu0 until target_function changes sign.
+
+        The step starts at 1 / beta and doubles each time. Returns None if
+        the sign does not change within max_doublings steps.
+        """
+        f0 = target_function(mu0)
+        if f0 == 0:
+            return mu0, mu0
+        direction = -1.0 if f0 > 0 else 1.0
+        a = mu0
+        step = 1.0 / beta
+        for _ in range(max_doublings):
+            b = mu0 + direction * step
+            if np.sign(target_function(b)) != np.sign(f0):
+                return min(a, b), max(a, b)
+            a = b
+            step *= 2.0
+        return None
+
+    def target_and_derivative(mu):
+        smeared_mu, derivative_mu = smear_and_deriv(
+            energies, beta, mu, out=smeared, out_deriv=derivative
+        )
+        return np.sum(smeared_mu) / n_k - n_target, np.sum(derivative_mu) / n_k
+
+    if smear_and_deriv is not None:
+        derivative = np.empty(energies.shape)
+        x0 = mu0 if mu0 is not None else 0.5 * (energies.min() + energies.max())
+        # A vanishing derivative (mu deep in a gap) is a failure we recover
+        # from below, so do not warn about it
+        with warnings.catch_warnings():
+            warnings.filterwarnings(
+                "ignore", message="Derivative was zero", category=RuntimeWarning
+            )
+            sol = root_scalar(
+                target_and_derivative,
+                x0=x0,
+                fprime=True,
+                method="newton",
+                xtol=1e-12,
+                maxiter=50,
+            )
+        if sol.converged and np.isfinite(sol.root):
+            return sol.root
+
+    # If the filling is monotonic in mu (which the caller promises by giving
+    # mu0) the root nearest to mu0 is the only one. The filling is smooth, so
+    # the hyperbolic extrapolation of brenth converges in fewer steps than brentq
+    if mu0 is not None:
+        bracket = bracket_from_guess(mu0)
+        if bracket is not None:
+            if bracket[0] == bracket[1]:
+                return bracket[0]
+            return brenth(target_function, *bracket, xtol=1e-12)
+
+    # Only scan the energies for the band edges if there is no good guess
+    e_min = energies.min()
+    e_max = energies.max()
     try:
-        res = brentq(target_function, e_min, e_max)
+        res = brenth(target_function, e_min, e_max, xtol=1e-12)
     except ValueError:
         e_min, e_max = adjust_brackets(e_min, e_max)
-        res = brentq(target_function, e_min, e_max)
+        res = brenth(target_function, e_min, e_max, xtol=1e-12)
 
     return res
@@ -17,10 +17,24 @@
 
 """k-space integrator on a grid using smearing functions."""
 
+from functools import lru_cache
+from math import factorial
+
 import numpy as np
+from numpy.polynomial.hermite import hermval
 from numpy.typing import ArrayLike
 
-from .from_triqs_hartree import fermi, update_mu
+from .from_triqs_hartree import update_mu
+
+
+@lru_cache(maxsize=8)
+def _methfessel_paxton_coeffs(N: int) -> np.ndarray:
+    # Coefficients A_n of H_{2n-1} for n = 1..N in a single Hermite series
+    coeffs = np.zeros(2 * N)
+    for n in range(1, N + 1):
+        coeffs[2 * n - 1] = (-1) ** n / (factorial(n) * 4**n * np.sqrt(np.pi))
+    coeffs.setflags(write=False)
+    return coeffs
 
 
 class SmearingKWeight:
@@ -66,6 +80,9 @@ class SmearingKWeight:
         #: int : Number of k-points.
         self.n_k: int
 
+        # Whether all blocks have been checked to be on the same grid
+        self._n_k_checked = False
+
         if method == "fermi":
             self.smear_function = self._fermi
         elif method == "gaussian":
@@ -77,46 +94,95 @@ class SmearingKWeight:
             raise ValueError(msg)
 
     @staticmethod
-    def _fermi(energies: ArrayLike, beta: float, mu: float) -> ArrayLike:
-        e = energies - mu
-        return fermi(e, beta)
+    def _fermi(
+        energies: ArrayLike, beta: float, mu: float, out: ArrayLike | None = None
+    ) -> ArrayLike:
+        from scipy.special import expit
+
+        # expit is the logistic function, stable for large arguments
+        if out is None:
+            return expit(-beta * (np.asarray(energies) - mu))
+        np.subtract(energies, mu, out=out, dtype=float)
+        out *= -beta
+        expit(out, out=out)
+        return out
+
+    @staticmethod
+    def _fermi_and_deriv(
+        energies: ArrayLike,
+        beta: float,
+        mu: float,
+        out: ArrayLike | None = None,
+        out_deriv: ArrayLike | None = None,
+    ) -> tuple[ArrayLike, ArrayLike]:
+        f = SmearingKWeight._fermi(energies, beta, mu, out=out)
+        # beta * f * (1 - f) accumulated in one buffer
+        deriv = np.subtract(1.0, f, out=out_deriv)
+        deriv *= f
+        deriv *= beta
+        return f, deriv
 
     @staticmethod
-    def _gaussian(energies: ArrayLike, beta: float, mu: float) -> ArrayLike:
+    def _gaussian(
+        energies: ArrayLike, beta: float, mu: float, out: ArrayLike | None = None
+    ) -> ArrayLike:
         from scipy.special import erfc
 
-        return 0.5 * erfc(beta * (energies - mu))
+        if out is None:
+            return 0.5 * erfc(beta * (np.asarray(energies) - mu))
+        np.subtract(energies, mu, out=out, dtype=float)
+        out *= beta
+        erfc(out, out=out)
+        out *= 0.5
+        return out
 
     @staticmethod
     def _methfessel_paxton(
-        energies: ArrayLike, beta: float, mu: float, N: int = 1
+        energies: ArrayLike,
+        beta: float,
+        mu: float,
+        N: int = 1,
+        out: ArrayLike | None = None,
     ) -> ArrayLike:
-        from scipy.special import erfc, factorial, hermite
-
-        def A_n(n):
-            return (-1) ** n / (factorial(n) * 4**n * np.sqrt(np.pi))
+        from scipy.special import erfc
 
         x = beta * (energies - mu)
 
-        S = 0.5 * erfc(x)  # S_0
-        for n in range(1, N + 1):
-            H_n = hermite(2 * n - 1)
-            S += A_n(n) * H_n(x) * np.exp(-(x**2))
+        S = erfc(x, out=out)
+        S *= 0.5  # S_0
+        if N > 0:
+            S += hermval(x, _methfessel_paxton_coeffs(N)) * np.exp(-(x**2))
         return S
 
     def _update_n_k(self) -> int:
         if isinstance(self.energies, dict):
             first_key = next(iter(self.energies))
-            self.n_k = self.energies[first_key].shape[0]
-            for en in self.energies.values():
-                if self.n_k != en.shape[0]:
-                    # FIXME Must they? I don't see why, but its weird to not
-                    msg = "Blocks must be on the same sized grid !"
-                    raise ValueError(msg)
+            n_k = self.energies[first_key].shape[0]
+            # The grid is fixed during a calculation, so only check all blocks
+            # the first time or when the grid changes size
+            if not self._n_k_checked or n_k != self.n_k:
+                for en in self.energies.values():
+                    if n_k != en.shape[0]:
+                        # FIXME Must they? I don't see why, but its weird to not
+                        msg = "Blocks must be on the same sized grid !"
+                        raise ValueError(msg)
+                self._n_k_checked = True
+            self.n_k = n_k
         else:
             self.n_k = self.energies.shape[0]
         return self.n_k
 
+    def _update_energies_flat(self) -> np.ndarray:
+        # All blocks in one contiguous buffer, so that the chemical potential
+        # search is a single vectorized call per iteration
+        if isinstance(self.energies, dict):
+            self._energies_flat = np.concatenate(
+                [np.ascontiguousarray(en).ravel() for en in self.energies.values()]
+            )
+        else:
+            self._energies_flat = np.ravel(self.energies)
+        return self._energies_flat
+
     def update_weights(self, energies: dict[ArrayLike]) -> dict[ArrayLike]:
         """
         Update the integral weighting factors at each k-point.
@@ -135,14 +201,43 @@ class SmearingKWeight:
         """
         self.energies = energies
         self._update_n_k()
+        self._update_energies_flat()
         if self.n_target is not None:
+            # Warm-starting from the previous mu needs the filling to be
+            # monotonic in mu, which it is not for methfessel-paxton
+            monotonic = self.smear_function in (self._fermi, self._gaussian)
+            # The derivative is only known in closed form for the Fermi
+            # function, to find mu with Newton's method. Checking here keeps a
+            # user-supplied smear_function from being paired with it.
+            smear_and_deriv = (
+                self._fermi_and_deriv if self.smear_function is self._fermi else None
+            )
             self.mu = update_mu(
-                self.n_target, self.energies, self.beta, self.n_k, self.smear_function
+                self.n_target,
+                self._energies_flat,
+                self.beta,
+                self.n_k,
+                self.smear_function,
+                mu0=self.mu if monotonic else None,
+                smear_and_deriv=smear_and_deriv,
             )
 
-        self.weights = {}
-        for bl in self.energies:
-            self.weights[bl] = (
-                self.smear_function(self.energies[bl], self.beta, self.mu) / self.n_k
-            )
+        # Smear all blocks in one call and return views of each block. The
+        # block loop only touches locals, so it stays cheap for many blocks.
+        energies = self.energies
+        # Not divided in place: the smearing function may return an integer
+        # array, or one that it keeps a reference to
+        weights_flat = (
+            self.smear_function(self._energies_flat, self.beta, self.mu) / self.n_k
+        )
+        if isinstance(energies, dict):
+            weights = {}
+            start = 0
+            for bl, en in energies.items():
+                stop = start + en.size
+                weights[bl] = weights_flat[start:stop].reshape(en.shape)
+                start = stop
+            self.weights = weights
+        else:
+            self.weights = weights_flat.reshape(np.shape(energies))
         return self.weights
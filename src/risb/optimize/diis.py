@@ -54,19 +54,22 @@ class DIIS(NewtonSolver):
 
     @staticmethod
     def extrapolate(
-        x: list[ArrayLike], g_x: list[ArrayLike], error: list[ArrayLike]
+        x: list[ArrayLike],  # noqa: ARG004
+        g_x: list[ArrayLike],
+        error: list[ArrayLike],
     ) -> np.ndarray:
         """DIIS extrapolation algorithm for the new guess for :attr:`x`."""
-        # Construct the B matrix
-        m = len(error)
-        B = np.empty(shape=(m, m))
-        for i in range(m):
-            for j in range(m):
-                B[i, j] = np.dot(error[i], error[j])
-
-        # Add the constraint lambda
-        B = np.column_stack((B, -np.ones(B.shape[0])))
-        B = np.vstack((B, -np.ones(B.shape[1])))
+        # Stack the history so the overlaps and the extrapolation are each
+        # a single matrix product
+        error = np.asarray(error)
+        g_x = np.asarray(g_x)
+        m = error.shape[0]
+
+        # Construct the B matrix with the constraint lambda
+        B = np.empty(shape=(m + 1, m + 1))
+        B[:m, :m] = error @ error.T
+        B[:m, m] = -1.0
+        B[m, :m] = -1.0
         B[m, m] = 0.0
 
         # Solve for the c coefficients (last element in c gives lambda constraint)
@@ -76,10 +79,7 @@ class DIIS(NewtonSolver):
         c = np.dot(scipy.linalg.pinv(B), rhs)
 
         # Calculate optimal x(n)
-        x_opt = np.zeros(x[0].shape)
-        for i in range(m):
-            x_opt += c[i] * g_x[i]
-        return x_opt
+        return c[:m] @ g_x
 
     # x_i, error(x_i), g(x_i) where g(x_i) is the fixed-point function
     # that gives a new x_i
@@ -18,9 +18,10 @@
 """Abstract base class for quasi-Newton methods."""
 
 import logging
+import math
 from abc import ABC, abstractmethod
+from collections import deque
 from collections.abc import Callable
-from copy import deepcopy
 from typing import Any
 
 import numpy as np
@@ -52,14 +53,18 @@ class NewtonSolver(ABC):
         self.n_restart = n_restart
         self.initialized = False
 
-        #: list[numpy.ndarray] : History of guesses to the root problem.
-        self.x: list[ArrayLike] = []
+        # The newest vector is at index 0 and the oldest is dropped once
+        # history_size - 1 vectors are stored
+        maxlen = max(history_size - 1, 0)
 
-        #: list[numpy.ndarray] : History of fixed point function with ``x`` as the input.
-        self.g_x: list[ArrayLike] = []
+        #: collections.deque[numpy.ndarray] : History of guesses to the root problem.
+        self.x: deque[ArrayLike] = deque(maxlen=maxlen)
 
-        #: list[numpy.ndarray] : History of error vector of ``x``.
-        self.error: list[ArrayLike] = []
+        #: collections.deque[numpy.ndarray] : History of fixed point function with ``x`` as the input.
+        self.g_x: deque[ArrayLike] = deque(maxlen=maxlen)
+
+        #: collections.deque[numpy.ndarray] : History of error vector of ``x``.
+        self.error: deque[ArrayLike] = deque(maxlen=maxlen)
 
         #: int : Iteration counter for solver.
         self.n: int = 0
@@ -78,8 +83,8 @@ class NewtonSolver(ABC):
             msg = "x and error are the wrong lengths !"
             raise ValueError(msg)
 
-        x_out = deepcopy(x)
-        error_out = deepcopy(error)
+        x_out = [np.copy(vec) for vec in x]
+        error_out = [np.copy(vec) for vec in error]
 
         while len(x_out) >= max_size:
             x_out.pop()
@@ -89,13 +94,10 @@ class NewtonSolver(ABC):
         return x_out, error_out
 
     @staticmethod
-    def _insert_vector(
-        vec: list[ArrayLike], vec_new: ArrayLike, max_size: int | None = None
-    ) -> None:
-        # Note these operations are mutable on input list
-        vec.insert(0, vec_new)
-        if max_size is not None and len(vec) >= max_size:
-            vec.pop()
+    def _insert_vector(vec: deque[ArrayLike], vec_new: ArrayLike) -> None:
+        # Note this is mutable on input deque, which drops its oldest vector
+        # when full
+        vec.appendleft(vec_new)
 
     @abstractmethod
     def update_x(self, **kwargs) -> np.ndarray:
@@ -153,32 +155,35 @@ class NewtonSolver(ABC):
         if options is None:
             options = {}
         self.success = False
-        x = deepcopy(x0)
+        x = np.array(x0, copy=True)
         if self.history_size > 0:
-            self._insert_vector(self.x, x, self.history_size)
+            self._insert_vector(self.x, x)
 
         for self.n in range(maxiter):
             g_x, error = fun(x, *args)
 
             if self.history_size > 0:
-                self._insert_vector(self.g_x, g_x, self.history_size)
-                self._insert_vector(self.error, error, self.history_size)
+                self._insert_vector(self.g_x, g_x)
+                self._insert_vector(self.error, error)
 
-            self.norm = np.linalg.norm(error)
+            # Squared 2-norm as a dot product, which avoids the overhead of
+            # the overflow-safe np.linalg.norm on these small vectors
+            norm_sq = np.vdot(error, error).real
+            self.norm = math.sqrt(norm_sq)
             logger.info(f"n: {self.n}, rms(risb): {self.norm}")
-            if self.norm < tol:
+            if norm_sq < tol * tol:
                 self.success = True
                 break
 
             x = self.update_x(**options)
 
             if (self.n % self.n_restart) == 0:
-                self.x = []
-                self.g_x = []
-                self.error = []
+                self.x.clear()
+                self.g_x.clear()
+                self.error.clear()
 
             if self.history_size > 0:
-                self._insert_vector(self.x, x, self.history_size)
+                self._insert_vector(self.x, x)
 
         if self.success:
             logger.info(f"The solution converged. nit: {self.n}, tol: {self.norm}")
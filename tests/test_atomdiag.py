@@ -24,25 +24,25 @@ def do_assert(
     N_expected,
     S2_expected,
 ):
-    abs = 1e-12
+    atol = 1e-12
     with subtests.test(msg="rho_f"):
         for bl in rho_f:
-            assert rho_f[bl] == pytest.approx(rho_f_expected, abs=abs)
+            assert rho_f[bl] == pytest.approx(rho_f_expected, abs=atol)
     with subtests.test(msg="rho_cf"):
         for bl in rho_cf:
-            assert rho_cf[bl] == pytest.approx(rho_cf_expected, abs=abs)
+            assert rho_cf[bl] == pytest.approx(rho_cf_expected, abs=atol)
     with subtests.test(msg="rho_c"):
         for bl in rho_c:
-            assert rho_c[bl] == pytest.approx(rho_c_expected, abs=abs)
+            assert rho_c[bl] == pytest.approx(rho_c_expected, abs=atol)
     with subtests.test(msg="gs_energy"):
-        assert gs_energy == pytest.approx(gs_energy_expected, abs=abs)
+        assert gs_energy == pytest.approx(gs_energy_expected, abs=atol)
     with subtests.test(msg="N"):
-        assert pytest.approx(N_expected, abs=abs) == N
+        assert pytest.approx(N_expected, abs=atol) == N
     with subtests.test(ms="S2"):
-        assert pytest.approx(S2_expected, abs=abs) == S2
+        assert pytest.approx(S2_expected, abs=atol) == S2
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def one_band():
     U = 1
     mu = U / 2.0  # half-filling
@@ -59,7 +59,7 @@ def one_band():
     return spin_names, n_orb, Lambda_c, D, h0_loc_mat, h_int
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def one_band_expected():
     rho_f_expected = np.array([[0.5]])
     rho_cf_expected = np.array([[0.4681588161332029]])
@@ -77,7 +77,7 @@ def one_band_expected():
     )
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def bilayer():
     U = 1
     V = 0.25
@@ -100,7 +100,7 @@ def bilayer():
     return spin_names, n_orb, Lambda_c, D, h0_loc_mat, h_int
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def bilayer_expected():
     rho_f_expected = np.array([[0.5, -0.1999913941210893], [-0.1999913941210893, 0.5]])
     rho_cf_expected = np.array([[0.42326519677453511, 0], [0, 0.42326519677453511]])
@@ -118,7 +118,7 @@ def bilayer_expected():
     )
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def dh_trimer():
     # At two-thirds filling
     U = 1
@@ -165,7 +165,7 @@ def dh_trimer():
     return spin_names, n_orb, Lambda_c, D, h0_loc_mat, h_int
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def dh_trimer_expected():
     rho_f_expected = np.array(
         [
@@ -2,7 +2,6 @@
 
 from pathlib import Path
 
-import h5py
 import numpy as np
 import pytest
 
@@ -10,80 +9,101 @@ from risb import helpers
 
 # FIXME finish helpers: lambda, r, f1, f2
 
-abs = 1e-12
-helpers_filename = Path(__file__).parent / Path("data_helpers.h5")
+ATOL = 1e-12
+HELPERS_PATH = Path(__file__).with_name("data_helpers.npz")
 
 
-def test_get_h_qp(subtests):
-    with h5py.File(helpers_filename, "r") as f:
-        h0_k = f["h0_k"][:]
-        eig_expected = f["eig"][:]
-        vec_expected = f["vec"][:]
-    R = np.zeros(shape=(2, 2))
-    np.fill_diagonal(R, 1)
-    Lambda = np.zeros(shape=(2, 2))
-    np.fill_diagonal(Lambda, 0.5)
-    h_qp = helpers.get_h_qp(R, Lambda, h0_k)
+def _read_only(A):
+    A.setflags(write=False)
+    return A
+
+
+# Inputs shared by several tests. They are read-only so a helper that
+# writes to its arguments fails instead of changing later tests.
+_R = _read_only(np.eye(2))
+_LAMBDA = _read_only(0.5 * np.eye(2))
+_RHO_QP = _read_only(np.diag([0.19618454, 0.19618454]))
+_KE = _read_only(np.diag([-0.13447044, -0.13447044]))
+_D = _read_only(np.diag([-0.33862285, -0.33862285]))
+
+
+@pytest.fixture(scope="module")
+def hdata():
+    # Read every array, inputs and expected results, once for the whole module
+    with np.load(HELPERS_PATH) as f:
+        return {k: _read_only(f[k]) for k in f.files}
+
+
+def test_get_h_qp(hdata):
+    h0_k = hdata["h0_k"]
+    eig_expected = hdata["eig"]
+    vec_expected = hdata["vec"]
+    h_qp = helpers.get_h_qp(_R, _LAMBDA, h0_k)
     eig, vec = np.linalg.eigh(h_qp)
-    with subtests.test(msg="eigenvalues"):
-        assert eig == pytest.approx(eig_expected, abs=abs)
-    with subtests.test(msg="eigenvectors"):
-        assert vec == pytest.approx(vec_expected, abs=abs)
-
-
-def test_get_h0_kin_k_R():
-    R = np.zeros(shape=(2, 2))
-    np.fill_diagonal(R, 1)
-    with h5py.File(helpers_filename, "r") as f:
-        h0_k = f["h0_k"][:]
-        vec = f["vec"][:]
-        h0_k_R_expected = f["h0_R"][:]
-    h0_k_R = helpers.get_h0_kin_k_R(R, h0_k, vec)
-    assert h0_k_R == pytest.approx(h0_k_R_expected, abs=abs)
-
-
-def test_get_ke():
-    with h5py.File(helpers_filename, "r") as f:
-        h0_k_R = f["h0_R"][:]
-        vec = f["vec"][:]
-        wks = f["wks"][:]
+    np.testing.assert_allclose(eig, eig_expected, rtol=0, atol=ATOL)
+    np.testing.assert_allclose(vec, vec_expected, rtol=0, atol=ATOL)
+
+
+def test_get_h_qp_out(hdata):
+    h0_k = hdata["h0_k"]
+    h_qp_expected = helpers.get_h_qp(_R, _LAMBDA, h0_k)
+    out = np.empty(h0_k.shape, dtype=complex)
+    h_qp = helpers.get_h_qp(_R, _LAMBDA, h0_k, out=out)
+    assert h_qp is out
+    np.testing.assert_allclose(h_qp, h_qp_expected, rtol=0, atol=ATOL)
+
+
+def test_get_h0_kin_k_R(hdata):
+    h0_k = hdata["h0_k"]
+    vec = hdata["vec"]
+    h0_k_R_expected = hdata["h0_R"]
+    h0_k_R = helpers.get_h0_kin_k_R(_R, h0_k, vec)
+    np.testing.assert_allclose(h0_k_R, h0_k_R_expected, rtol=0, atol=ATOL)
+
+
+def test_get_h0_kin_k_shared_blocks(hdata):
+    # Blocks that share one array, as in the examples, must each have the
+    # local term removed once
+    h0_k = hdata["h0_k"] + np.array([[0.3, 0.1], [0.1, -0.2]])
+    h0_k_before = h0_k.copy()
+    h0_kin_k = helpers.get_h0_kin_k({"up": h0_k, "dn": h0_k})
+    h0_kin_k_expected = h0_k - helpers.get_h0_loc_matrix(h0_k)
+    for bl in ["up", "dn"]:
+        np.testing.assert_allclose(h0_kin_k[bl], h0_kin_k_expected, rtol=0, atol=ATOL)
+    np.testing.assert_array_equal(h0_k, h0_k_before)
+
+
+def test_get_ke(hdata):
+    h0_k_R = hdata["h0_R"]
+    vec = hdata["vec"]
+    wks = hdata["wks"]
     ke = helpers.get_ke(h0_k_R, vec, wks)
-    ke_expected = np.array([[-0.36035732126514364, 0], [0, -0.36035732126514364]])
-    assert ke == pytest.approx(ke_expected, abs=abs)
+    ke_expected = hdata["ke"]
+    np.testing.assert_allclose(ke, ke_expected, rtol=0, atol=ATOL)
 
 
-def test_get_rho_qp():
-    with h5py.File(helpers_filename, "r") as f:
-        vec = f["vec"][:]
-        wks = f["wks"][:]
+def test_get_rho_qp(hdata):
+    vec = hdata["vec"]
+    wks = hdata["wks"]
     rho_qp = helpers.get_rho_qp(vec, wks)
-    rho_qp_expected = np.array([[0.30667105643085796, 0], [0, 0.30667105643085796]])
-    assert rho_qp == pytest.approx(rho_qp_expected, abs=abs)
-
-
-def test_get_d():
-    rho_qp = np.array([[0.19618454, 0.0], [0.0, 0.19618454]])
-    ke = np.array([[-0.13447044, 0.0], [0.0, -0.13447044]])
-    D = helpers.get_d(rho_qp, ke)
-    D_expected = np.array([[-0.33862284815908383, 0.0], [0.0, -0.33862284815908383]])
-    assert pytest.approx(D_expected, abs=abs) == D
+    rho_qp_expected = hdata["rho_qp"]
+    np.testing.assert_allclose(rho_qp, rho_qp_expected, rtol=0, atol=ATOL)
 
 
-def test_get_lambda_c():
-    Lambda = np.array([[0.5, 0.0], [0.0, 0.5]])
-    R = np.array([[1.0, 0.0], [0.0, 1.0]])
-    rho_qp = np.array([[0.19618454, 0.0], [0.0, 0.19618454]])
-    D = np.array([[-0.33862285, 0.0], [0.0, -0.33862285]])
-    Lambda_c = helpers.get_lambda_c(rho_qp, R, Lambda, D)
-    Lambda_c_expected = np.array(
-        [[0.018138135818154377, 0.0], [0.0, 0.018138135818154377]]
-    )
-    assert Lambda_c == pytest.approx(Lambda_c_expected, abs=abs)
+@pytest.mark.parametrize(
+    ("helper", "args", "expected"),
+    [
+        (helpers.get_d, (_RHO_QP, _KE), "D"),
+        (helpers.get_lambda_c, (_RHO_QP, _R, _LAMBDA, _D), "Lambda_c"),
+    ],
+    ids=["get_d", "get_lambda_c"],
+)
+def test_get_mf_matrix(hdata, helper, args, expected):
+    np.testing.assert_allclose(helper(*args), hdata[expected], rtol=0, atol=ATOL)
 
 
 def test_get_lambda():
-    # R = np.zeros(shape=(2,2))
-    # np.fill_diagonal(R, 1.0)
+    # R = np.eye(2)
     # Lambda = helpers.get_lambda(R, D, Lambda_c, rho_f)
     pass
 
@@ -94,8 +114,7 @@ def test_get_R():
 
 
 def test_get_f1():
-    # R = np.zeros(shape=(2,2))
-    # np.fill_diagonal(R, 1.0)
+    # R = np.eye(2)
     # f1 = helpers.get_f1(rho_cf, rho_qp, R)
     pass
 
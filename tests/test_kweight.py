@@ -0,0 +1,114 @@
+# ruff: noqa: T201, D100, D103
+
+import numpy as np
+import pytest
+from scipy.optimize import brentq
+from scipy.special import expit
+from test_common import build_cubic_h0_k
+
+from risb.kweight import SmearingKWeight
+from risb.kweight import kweight as kweight_module
+
+BETA = 20
+N_TARGET = 1.3
+ATOL = 1e-10
+
+
+@pytest.fixture(scope="module")
+def metallic():
+    h0_k = build_cubic_h0_k(gf_struct=[("up", 2), ("dn", 2)], nkx=6, spatial_dim=2)
+    hyb = 0.1 * np.array([[0, 1], [1, 0]])
+    return {bl: np.linalg.eigvalsh(h + hyb) for bl, h in h0_k.items()}
+
+
+@pytest.fixture()
+def update_mu_spy(monkeypatch):
+    # Record the mu0 that SmearingKWeight passes to update_mu
+    mu0_calls = []
+    update_mu = kweight_module.update_mu
+
+    def spy(*args, **kwargs):
+        mu0_calls.append(kwargs.get("mu0"))
+        return update_mu(*args, **kwargs)
+
+    monkeypatch.setattr(kweight_module, "update_mu", spy)
+    return mu0_calls
+
+
+def test_warm_start_gaussian(metallic, update_mu_spy):
+    shifted = {bl: en + 0.01 for bl, en in metallic.items()}
+    kweight = SmearingKWeight(beta=BETA, n_target=N_TARGET, method="gaussian")
+    kweight.update_weights(metallic)
+    kweight.update_weights(shifted)
+    assert update_mu_spy[-1] is not None
+
+    cold = SmearingKWeight(beta=BETA, n_target=N_TARGET, method="gaussian")
+    cold.update_weights(shifted)
+    assert kweight.mu == pytest.approx(cold.mu, abs=ATOL)
+
+
+def test_no_warm_start_methfessel_paxton(metallic, update_mu_spy):
+    shifted = {bl: en + 0.01 for bl, en in metallic.items()}
+    kweight = SmearingKWeight(beta=BETA, n_target=N_TARGET, method="methfessel-paxton")
+    kweight.update_weights(metallic)
+    kweight.update_weights(shifted)
+    assert update_mu_spy == [None, None]
+
+
+@pytest.fixture(scope="module")
+def gapped():
+    # Two flat-ish bands far apart, so at large beta the derivative of the
+    # filling underflows to zero in the gap
+    rng = np.random.default_rng(0)
+    band = rng.uniform(-0.1, 0.1, size=(36, 1))
+    return {"up": np.hstack([band - 2, band + 2])}
+
+
+def fermi_filling(energies, beta, mu, n_k):
+    return sum(np.sum(expit(-beta * (en - mu))) for en in energies.values()) / n_k
+
+
+def brentq_mu(filling, energies, n_target):
+    e_min = min(en.min() for en in energies.values())
+    e_max = max(en.max() for en in energies.values())
+    return brentq(lambda mu: filling(mu) - n_target, e_min, e_max, xtol=1e-14)
+
+
+def test_fermi_metallic(metallic):
+    kweight = SmearingKWeight(beta=BETA, n_target=N_TARGET)
+    weights = kweight.update_weights(metallic)
+    assert sum(np.sum(w) for w in weights.values()) == pytest.approx(N_TARGET, abs=ATOL)
+
+    n_k = metallic["up"].shape[0]
+    mu_expected = brentq_mu(
+        lambda mu: fermi_filling(metallic, BETA, mu, n_k), metallic, N_TARGET
+    )
+    assert kweight.mu == pytest.approx(mu_expected, abs=ATOL)
+
+
+@pytest.mark.filterwarnings("error")
+def test_fermi_gapped(gapped):
+    # Newton's method starts in the gap with a zero derivative, so the
+    # bracketing search has to find mu
+    kweight = SmearingKWeight(beta=1000, n_target=1)
+    weights = kweight.update_weights(gapped)
+    assert np.sum(weights["up"]) == pytest.approx(1, abs=ATOL)
+    assert -1.9 < kweight.mu < 1.9
+
+
+def test_custom_smear_function(metallic):
+    # A smearing function without an out argument, narrower than the Fermi
+    # function so that finding mu with the Fermi derivative would be wrong
+    def smear_function(energies, beta, mu):
+        return expit(-2 * beta * (energies - mu))
+
+    kweight = SmearingKWeight(beta=BETA, n_target=N_TARGET)
+    kweight.smear_function = smear_function
+    weights = kweight.update_weights(metallic)
+    assert sum(np.sum(w) for w in weights.values()) == pytest.approx(N_TARGET, abs=ATOL)
+
+    n_k = metallic["up"].shape[0]
+    mu_expected = brentq_mu(
+        lambda mu: fermi_filling(metallic, 2 * BETA, mu, n_k), metallic, N_TARGET
+    )
+    assert kweight.mu == pytest.approx(mu_expected, abs=ATOL)
@@ -17,17 +17,17 @@ from risb.kweight import SmearingKWeight
 
 def do_assert(subtests, mu, Lambda, Z, mu_expected, Lambda_expected, Z_expected):
     n_clusters = len(Lambda)
-    abs = 1e-10
+    atol = 1e-10
     with subtests.test(msg="mu"):
-        assert mu == pytest.approx(mu_expected, abs=abs)
+        assert mu == pytest.approx(mu_expected, abs=atol)
     with subtests.test(msg="Lambda"):
         for i in range(n_clusters):
             for bl in Lambda[i]:
-                assert Lambda[i][bl] == pytest.approx(Lambda_expected, abs=abs)
+                assert Lambda[i][bl] == pytest.approx(Lambda_expected, abs=atol)
     with subtests.test(msg="Z"):
         for i in range(n_clusters):
             for bl in Z[i]:
-                assert Z[i][bl] == pytest.approx(Z_expected, abs=abs)
+                assert Z[i][bl] == pytest.approx(Z_expected, abs=atol)
 
 
 @pytest.fixture()